@@ -0,0 +1,135 @@
+import secrets
+import struct
+import zlib
+
+from django.utils.text import compress_string
+
+try:
+    import brotli
+except ImportError:  # pragma: no cover - brotli is optional
+    brotli = None
+
+
+class GzipStream:
+    """
+    Incremental gzip encoder that emits output after every chunk.
+
+    Each chunk is followed by a sync flush, so a client can render what it
+    has received so far instead of waiting for the compressor's internal
+    buffer to fill. Like ``django.utils.text.compress_sequence``, a random
+    length file name is written into the header to mitigate BREACH.
+    """
+
+    def __init__(self, level=6, max_random_bytes=None):
+        self.compressor = zlib.compressobj(level, zlib.DEFLATED, -zlib.MAX_WBITS)
+        self.crc = 0
+        self.size = 0
+        self.filename = (
+            b"a" * secrets.randbelow(max_random_bytes) if max_random_bytes else b""
+        )
+
+    def header(self):
+        flags = 0x08 if self.filename else 0
+        header = struct.pack("<BBBBIBB", 0x1F, 0x8B, 8, flags, 0, 0, 255)
+        if self.filename:
+            header += self.filename + b"\x00"
+        return header
+
+    def compress(self, chunk):
+        self.crc = zlib.crc32(chunk, self.crc)
+        self.size += len(chunk)
+        return self.compressor.compress(chunk) + self.compressor.flush(
+            zlib.Z_SYNC_FLUSH
+        )
+
+    def finish(self):
+        trailer = struct.pack("<II", self.crc & 0xFFFFFFFF, self.size & 0xFFFFFFFF)
+        return self.compressor.flush() + trailer
+
+
+class BrotliStream:
+    """
+    Incremental brotli encoder that flushes after every chunk.
+
+    Unlike ``GzipStream`` it adds no random-length padding against BREACH;
+    the ``brotli`` package has no way to emit padding blocks.
+    """
+
+    def __init__(self, quality=5):
+        self.compressor = brotli.Compressor(quality=quality)
+
+    def header(self):
+        return b""
+
+    def compress(self, chunk):
+        return self.compressor.process(chunk) + self.compressor.flush()
+
+    def finish(self):
+        return self.compressor.finish()
+
+
+def parse_accept_encoding(header):
+    """Return ``{coding: quality}`` for an ``Accept-Encoding`` header."""
+    accepted = {}
+    for item in header.split(","):
+        coding, _, params = item.strip().lower().partition(";")
+        quality = 1.0
+        params = params.strip()
+        if params.startswith("q="):
+            try:
+                quality = float(params[2:])
+            except ValueError:
+                quality = 0.0
+        accepted[coding.strip()] = quality
+    return accepted
+
+
+def select_encoding(header, encodings):
+    """
+    Return the first of ``encodings`` that the ``Accept-Encoding`` header
+    allows (quality above zero), or None.
+    """
+    accepted = parse_accept_encoding(header)
+    for encoding in encodings:
+        if accepted.get(encoding, accepted.get("*", 0)) > 0:
+            return encoding
+    return None
+
+
+def available_encodings():
+    """Return the content codings this process can produce, best first."""
+    if brotli is not None:
+        return ("br", "gzip")
+    return ("gzip",)
+
+
+def compress(encoding, content, max_random_bytes=None):
+    if encoding == "br":
+        return brotli.compress(content, quality=5)
+    return compress_string(content, max_random_bytes=max_random_bytes)
+
+
+def _open_stream(encoding, max_random_bytes):
+    if encoding == "br":
+        return BrotliStream()
+    return GzipStream(max_random_bytes=max_random_bytes)
+
+
+def compress_stream(encoding, sequence, max_random_bytes=None):
+    stream = _open_stream(encoding, max_random_bytes)
+    if header := stream.header():
+        yield header
+    for chunk in sequence:
+        if chunk:
+            yield stream.compress(chunk)
+    yield stream.finish()
+
+
+async def compress_stream_async(encoding, sequence, max_random_bytes=None):
+    stream = _open_stream(encoding, max_random_bytes)
+    if header := stream.header():
+        yield header
+    async for chunk in sequence:
+        if chunk:
+            yield stream.compress(chunk)
+    yield stream.finish()
@@ -0,0 +1,163 @@
+import mimetypes
+import re
+from pathlib import Path
+
+from django.conf import settings
+from django.core.exceptions import SuspiciousFileOperation
+from django.http import FileResponse, HttpResponseNotModified
+from django.utils._os import safe_join
+from django.utils.cache import patch_vary_headers
+from django.utils.deprecation import MiddlewareMixin
+from django.utils.http import http_date
+from django.views.static import was_modified_since
+
+from . import compression
+
+re_hashed_name = re.compile(r"\.[0-9a-f]{12}\.[^./]+$")
+
+
+class StaticFilesMiddleware:
+    """
+    Serve files collected into ``STATIC_ROOT`` without reaching the URL
+    resolver or any view.
+
+    Pre-compressed ``.br`` / ``.gz`` variants written by
+    ``CompressedManifestStaticFilesStorage`` are chosen according to the
+    request's ``Accept-Encoding`` header. Files carrying a manifest hash in
+    their name are served with a far-future, immutable ``Cache-Control``.
+    """
+
+    encodings = (("br", ".br"), ("gzip", ".gz"))
+    immutable_max_age = 60 * 60 * 24 * 365
+    default_max_age = 60
+
+    def __init__(self, get_response):
+        self.get_response = get_response
+        self.prefix = "/" + settings.STATIC_URL.lstrip("/")
+        self.root = settings.STATIC_ROOT
+
+    def __call__(self, request):
+        if (
+            self.root
+            and request.method in ("GET", "HEAD")
+            and request.path_info.startswith(self.prefix)
+        ):
+            response = self.serve(request, request.path_info[len(self.prefix) :])
+            if response is not None:
+                return response
+        return self.get_response(request)
+
+    def serve(self, request, name):
+        try:
+            path = Path(safe_join(self.root, name))
+        except SuspiciousFileOperation:
+            return None
+        if not path.is_file():
+            return None
+
+        encoding, served = self.select_variant(request, path)
+        stat = served.stat()
+        if not was_modified_since(
+            request.META.get("HTTP_IF_MODIFIED_SINCE"), stat.st_mtime
+        ):
+            response = HttpResponseNotModified()
+        else:
+            content_type, file_encoding = mimetypes.guess_type(path.name)
+            if file_encoding or not content_type:
+                content_type = "application/octet-stream"
+            response = FileResponse(served.open("rb"), content_type=content_type)
+            response.headers["Content-Length"] = str(stat.st_size)
+            if encoding:
+                response.headers["Content-Encoding"] = encoding
+
+        response.headers["Last-Modified"] = http_date(stat.st_mtime)
+        response.headers["Cache-Control"] = self.cache_control(name)
+        patch_vary_headers(response, ("Accept-Encoding",))
+        return response
+
+    def select_variant(self, request, path):
+        variants = {}
+        for encoding, suffix in self.encodings:
+            variant = path.with_name(path.name + suffix)
+            if variant.is_file():
+                variants[encoding] = variant
+        encoding = compression.select_encoding(
+            request.META.get("HTTP_ACCEPT_ENCODING", ""), variants
+        )
+        if encoding is None:
+            return None, path
+        return encoding, variants[encoding]
+
+    def cache_control(self, name):
+        if re_hashed_name.search(name):
+            return f"public, max-age={self.immutable_max_age}, immutable"
+        return f"public, max-age={self.default_max_age}"
+
+
+class CompressionMiddleware(MiddlewareMixin):
+    """
+    Compress responses with the best coding the client accepts, preferring
+    brotli over gzip.
+
+    Responses shorter than ``min_length`` are left alone. Streaming
+    responses are compressed chunk by chunk, each chunk flushed to the
+    client as soon as it is produced, so streamed pages keep their early
+    first byte.
+
+    Like ``GZipMiddleware``, gzip output carries a random-length file name
+    to mitigate BREACH. Brotli has no equivalent padding; brotli responses
+    rely on Django masking the CSRF token differently on every request.
+    """
+
+    min_length = 512
+    max_random_bytes = 100
+
+    def process_response(self, request, response):
+        if not response.streaming and len(response.content) < self.min_length:
+            return response
+
+        # Avoid compressing if we've already got a content-encoding.
+        if response.has_header("Content-Encoding"):
+            return response
+
+        patch_vary_headers(response, ("Accept-Encoding",))
+
+        encoding = self.select_encoding(request)
+        if encoding is None:
+            return response
+
+        if response.streaming:
+            if response.is_async:
+                response.streaming_content = compression.compress_stream_async(
+                    encoding,
+                    response.streaming_content,
+                    max_random_bytes=self.max_random_bytes,
+                )
+            else:
+                response.streaming_content = compression.compress_stream(
+                    encoding,
+                    response.streaming_content,
+                    max_random_bytes=self.max_random_bytes,
+                )
+            del response.headers["Content-Length"]
+        else:
+            compressed_content = compression.compress(
+                encoding, response.content, max_random_bytes=self.max_random_bytes
+            )
+            if len(compressed_content) >= len(response.content):
+                return response
+            response.content = compressed_content
+            response.headers["Content-Length"] = str(len(response.content))
+
+        etag = response.get("ETag")
+        if etag and etag.startswith('"'):
+            response.headers["ETag"] = "W/" + etag
+        response.headers["Content-Encoding"] = encoding
+
+        return response
+
+    def select_encoding(self, request):
+        return compression.select_encoding(
+            request.META.get("HTTP_ACCEPT_ENCODING", ""),
+            compression.available_encodings(),
+        )
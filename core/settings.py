@@ -14,10 +14,12 @@ INSTALLED_APPS = [
     "django.contrib.staticfiles",
     # Custom apps
     "todos",
+    "jobs",
 ]
 
 MIDDLEWARE = [
     "django.middleware.security.SecurityMiddleware",
+    "core.middleware.CompressionMiddleware",
     "django.contrib.sessions.middleware.SessionMiddleware",
     "django.middleware.common.CommonMiddleware",
     "django.middleware.csrf.CsrfViewMiddleware",
@@ -45,6 +47,9 @@ TEMPLATES = [
 
 WSGI_APPLICATION = "core.wsgi.application"
 
+# Warm URL resolvers and templates when core.wsgi / core.asgi is imported.
+PRELOAD_ON_STARTUP = False
+
 DATABASES = {
     "default": {
         "ENGINE": "django.db.backends.sqlite3",
@@ -72,4 +77,14 @@ TIME_ZONE = "UTC"
 USE_I18N = True
 USE_TZ = True
 STATIC_URL = "static/"
+STATIC_ROOT = BASE_DIR / "staticfiles"
 DEFAULT_AUTO_FIELD = "django.db.models.BigAutoField"
+
+# Stream the task list table in chunks instead of rendering it in one go.
+TODOS_STREAM_TASK_LIST = False
+
+# Seconds a task form's idempotency key is remembered to absorb resubmits.
+# Nothing deletes expired keys on its own: schedule
+# ``manage.py purge_idempotency_keys`` (e.g. from cron) or enqueue
+# ``todos.tasks.purge_idempotency_keys`` periodically.
+TODOS_IDEMPOTENCY_KEY_TTL = 60 * 60 * 24
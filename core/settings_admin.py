@@ -0,0 +1,23 @@
+"""
+Production settings for the admin worker pool.
+
+Same as ``core.settings_production`` plus the admin, auth, contenttypes
+and sessions apps, served from ``core.urls``.
+
+This profile covers every app, so run ``manage.py migrate`` and
+``manage.py collectstatic`` with it. Both worker pools share the same
+database and ``STATIC_ROOT``.
+"""
+
+from . import settings as base
+from .settings_production import *  # noqa: F401,F403
+
+INSTALLED_APPS = base.INSTALLED_APPS
+TEMPLATES = base.TEMPLATES
+ROOT_URLCONF = base.ROOT_URLCONF
+
+MIDDLEWARE = list(base.MIDDLEWARE)
+MIDDLEWARE.insert(
+    MIDDLEWARE.index("django.middleware.security.SecurityMiddleware") + 1,
+    "core.middleware.StaticFilesMiddleware",
+)
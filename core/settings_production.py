@@ -0,0 +1,76 @@
+"""
+Production settings for core project.
+
+Select with ``DJANGO_SETTINGS_MODULE=core.settings_production``.
+
+This profile serves the todo pages only. The admin and the apps it needs
+run on a separate worker pool with ``core.settings_admin``. Run
+``manage.py migrate`` and ``manage.py collectstatic`` with
+``core.settings_admin`` before starting workers, so the admin's tables and
+static files are included.
+
+Set ``DJANGO_SECRET_KEY`` and ``DJANGO_ALLOWED_HOSTS`` in the environment.
+"""
+
+import os
+
+from .settings import *  # noqa: F401,F403
+from .settings import INSTALLED_APPS, MIDDLEWARE, TEMPLATES
+
+DEBUG = False
+# Never fall back to the development key: Django refuses to use an empty one.
+SECRET_KEY = os.environ.get("DJANGO_SECRET_KEY", "")
+ALLOWED_HOSTS = os.environ.get("DJANGO_ALLOWED_HOSTS", "localhost").split(",")
+
+STORAGES = {
+    "default": {
+        "BACKEND": "django.core.files.storage.FileSystemStorage",
+    },
+    "staticfiles": {
+        "BACKEND": "core.storage.CompressedManifestStaticFilesStorage",
+    },
+}
+
+# Serve collected static files before the rest of the stack runs.
+MIDDLEWARE = list(MIDDLEWARE)
+MIDDLEWARE.insert(
+    MIDDLEWARE.index("django.middleware.security.SecurityMiddleware") + 1,
+    "core.middleware.StaticFilesMiddleware",
+)
+
+# Apps, middleware and context processors only the admin needs.
+ADMIN_APPS = [
+    "django.contrib.admin",
+    "django.contrib.auth",
+    "django.contrib.contenttypes",
+    "django.contrib.sessions",
+]
+ADMIN_MIDDLEWARE = [
+    "django.contrib.sessions.middleware.SessionMiddleware",
+    "django.contrib.auth.middleware.AuthenticationMiddleware",
+]
+
+INSTALLED_APPS = [app for app in INSTALLED_APPS if app not in ADMIN_APPS]
+MIDDLEWARE = [name for name in MIDDLEWARE if name not in ADMIN_MIDDLEWARE]
+ADMIN_CONTEXT_PROCESSORS = [
+    "django.contrib.auth.context_processors.auth",
+]
+TEMPLATES = [
+    {
+        **TEMPLATES[0],
+        "OPTIONS": {
+            **TEMPLATES[0]["OPTIONS"],
+            "context_processors": [
+                name
+                for name in TEMPLATES[0]["OPTIONS"]["context_processors"]
+                if name not in ADMIN_CONTEXT_PROCESSORS
+            ],
+        },
+    },
+]
+ROOT_URLCONF = "core.urls_public"
+# Without sessions, flash messages travel in a signed cookie.
+MESSAGE_STORAGE = "django.contrib.messages.storage.cookie.CookieStorage"
+
+TODOS_STREAM_TASK_LIST = True
+PRELOAD_ON_STARTUP = True
@@ -0,0 +1,79 @@
+import gzip
+from pathlib import Path
+
+from django.contrib.staticfiles.storage import ManifestStaticFilesStorage
+
+try:
+    import brotli
+except ImportError:  # pragma: no cover - brotli is optional
+    brotli = None
+
+
+class CompressedManifestStaticFilesStorage(ManifestStaticFilesStorage):
+    """
+    Manifest storage that also writes pre-compressed ``.gz`` and ``.br``
+    variants of text assets during ``collectstatic``.
+
+    The ``.br`` files are only produced when the ``brotli`` package is
+    installed. A variant is kept only if it is meaningfully smaller than
+    the original file.
+    """
+
+    compressible_extensions = (
+        ".css",
+        ".js",
+        ".map",
+        ".svg",
+        ".txt",
+        ".html",
+        ".json",
+        ".xml",
+    )
+    min_size = 256
+    min_ratio = 0.95
+    gzip_level = 9
+    # brotli's default quality, 11, is over 30 times slower than 8 on the
+    # admin's assets for output about 10% smaller. Subclass to raise it.
+    brotli_quality = 8
+
+    def post_process(self, paths, dry_run=False, **options):
+        # The parent yields a file again on each pass that rewrites it, so
+        # wait for the final hashed names and compress each file once.
+        final = {}
+        for name, hashed_name, processed in super().post_process(
+            paths, dry_run=dry_run, **options
+        ):
+            if hashed_name and not isinstance(processed, Exception):
+                final[name] = hashed_name
+            yield name, hashed_name, processed
+        if not dry_run:
+            for name, hashed_name in final.items():
+                self.compress(name)
+                self.compress(hashed_name)
+
+    def compress(self, name):
+        if not name.endswith(self.compressible_extensions):
+            return
+        path = Path(self.path(name))
+        if not path.is_file():
+            return
+        content = path.read_bytes()
+        if len(content) < self.min_size:
+            return
+        self._write_variant(
+            path, ".gz", gzip.compress(content, self.gzip_level, mtime=0), content
+        )
+        if brotli is not None:
+            self._write_variant(
+                path,
+                ".br",
+                brotli.compress(content, quality=self.brotli_quality),
+                content,
+            )
+
+    def _write_variant(self, path, suffix, compressed, original):
+        variant = path.with_name(path.name + suffix)
+        if len(compressed) < len(original) * self.min_ratio:
+            variant.write_bytes(compressed)
+        elif variant.exists():
+            variant.unlink()
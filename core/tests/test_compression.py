@@ -0,0 +1,82 @@
+import gzip
+import zlib
+
+import pytest
+from django.http import HttpResponse, StreamingHttpResponse
+from django.test import RequestFactory
+
+from core import compression
+from core.middleware import CompressionMiddleware
+
+BODY = b"<tr><td>Task</td><td>No description</td></tr>\n" * 200
+
+
+def get_response(content):
+    return lambda request: content
+
+
+class TestCompressionMiddleware:
+    def setup_method(self):
+        self.factory = RequestFactory()
+
+    def process(self, response, accept_encoding="gzip"):
+        request = self.factory.get("/", HTTP_ACCEPT_ENCODING=accept_encoding)
+        return CompressionMiddleware(get_response(response))(request)
+
+    def test_compresses_large_response(self):
+        """Test large responses are gzipped when the client accepts gzip"""
+        response = self.process(HttpResponse(BODY))
+
+        assert response["Content-Encoding"] == "gzip"
+        assert response["Vary"] == "Accept-Encoding"
+        assert int(response["Content-Length"]) < len(BODY)
+        assert gzip.decompress(response.content) == BODY
+
+    def test_skips_small_response(self):
+        """Test responses below the minimum length are sent as-is"""
+        response = self.process(HttpResponse(b"short"))
+
+        assert not response.has_header("Content-Encoding")
+        assert response.content == b"short"
+
+    def test_skips_when_not_accepted(self):
+        """Test nothing is compressed without a matching Accept-Encoding"""
+        response = self.process(HttpResponse(BODY), accept_encoding="identity")
+
+        assert not response.has_header("Content-Encoding")
+        assert response.content == BODY
+
+    def test_respects_zero_quality(self):
+        """Test an explicit q=0 disables that coding"""
+        response = self.process(
+            HttpResponse(BODY), accept_encoding="gzip;q=0, br;q=0"
+        )
+
+        assert not response.has_header("Content-Encoding")
+
+    def test_streaming_response_is_compressed_incrementally(self):
+        """Test each streamed chunk yields compressed output immediately"""
+        chunks = [BODY[:1000], BODY[1000:2000], BODY[2000:]]
+        response = self.process(StreamingHttpResponse(iter(chunks)))
+
+        assert response["Content-Encoding"] == "gzip"
+        assert not response.has_header("Content-Length")
+
+        content = iter(response.streaming_content)
+        header = next(content)
+        first = next(content)
+        assert first
+        # A sync-flushed chunk is decodable without the rest of the stream.
+        partial = zlib.decompressobj(31).decompress(header + first)
+        assert partial == chunks[0]
+
+        body = header + first + b"".join(content)
+        assert gzip.decompress(body) == BODY
+
+    @pytest.mark.skipif(compression.brotli is None, reason="brotli not installed")
+    def test_prefers_brotli(self):
+        """Test brotli is chosen over gzip when both are accepted"""
+        response = self.process(HttpResponse(BODY), accept_encoding="gzip, br")
+
+        assert response["Content-Encoding"] == "br"
+        assert compression.brotli.decompress(response.content) == BODY
@@ -0,0 +1,47 @@
+from django.template import engines
+
+from core import settings, settings_admin, settings_production
+from core.preload import preload
+
+
+class TestPreload:
+    def test_preload_compiles_templates(self):
+        """Test preload fills the cached template loader"""
+        engine = engines["django"].engine
+        engine.template_loaders[0].reset()
+
+        assert preload() > 0
+
+        cached = engine.template_loaders[0].get_template_cache
+        assert "todos/task_list.html" in cached
+
+
+class TestProductionProfiles:
+    def test_production_profile_drops_admin(self):
+        """Test the web profile runs without the admin stack"""
+        for app in settings_production.ADMIN_APPS:
+            assert app not in settings_production.INSTALLED_APPS
+        for name in settings_production.ADMIN_MIDDLEWARE:
+            assert name not in settings_production.MIDDLEWARE
+        assert settings_production.ROOT_URLCONF == "core.urls_public"
+
+    def test_production_profile_keeps_other_context_processors(self):
+        """Test only the auth context processor is dropped from the base"""
+        base = settings.TEMPLATES[0]["OPTIONS"]["context_processors"]
+        lean = settings_production.TEMPLATES[0]["OPTIONS"]["context_processors"]
+
+        assert lean == [
+            name
+            for name in base
+            if name != "django.contrib.auth.context_processors.auth"
+        ]
+
+    def test_admin_profile_keeps_admin(self):
+        """Test the admin profile restores the admin stack"""
+        assert "django.contrib.admin" in settings_admin.INSTALLED_APPS
+        assert "core.middleware.StaticFilesMiddleware" in settings_admin.MIDDLEWARE
+        assert settings_admin.ROOT_URLCONF == "core.urls"
+
+    def test_production_profile_does_not_reuse_development_key(self):
+        """Test the production secret key comes from the environment"""
+        assert settings_production.SECRET_KEY != settings.SECRET_KEY
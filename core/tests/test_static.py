@@ -0,0 +1,89 @@
+import gzip
+import json
+
+import pytest
+from django.core.management import call_command
+from django.test import Client
+
+STATIC_STORAGES = {
+    "default": {"BACKEND": "django.core.files.storage.FileSystemStorage"},
+    "staticfiles": {"BACKEND": "core.storage.CompressedManifestStaticFilesStorage"},
+}
+
+
+@pytest.fixture
+def collected(settings, tmp_path):
+    """Run collectstatic into a temporary STATIC_ROOT"""
+    settings.STATIC_ROOT = tmp_path
+    settings.STORAGES = STATIC_STORAGES
+    settings.MIDDLEWARE = [
+        "core.middleware.StaticFilesMiddleware",
+        *settings.MIDDLEWARE,
+    ]
+    call_command("collectstatic", interactive=False, verbosity=0)
+    manifest = json.loads((tmp_path / "staticfiles.json").read_text())
+    return tmp_path, manifest["paths"]
+
+
+class TestCompressedManifestStorage:
+    def test_hashed_css_has_gzip_variant(self, collected):
+        """Test collectstatic writes a .gz next to the hashed stylesheet"""
+        root, paths = collected
+        hashed = root / paths["todos/css/style.css"]
+        variant = hashed.with_name(hashed.name + ".gz")
+
+        assert variant.is_file()
+        assert gzip.decompress(variant.read_bytes()) == hashed.read_bytes()
+
+
+@pytest.mark.django_db
+class TestStaticFilesMiddleware:
+    def setup_method(self):
+        self.client = Client()
+
+    def test_hashed_file_is_immutable(self, collected):
+        """Test hashed files are served with a far-future cache header"""
+        _, paths = collected
+        response = self.client.get("/static/" + paths["todos/css/style.css"])
+
+        assert response.status_code == 200
+        assert response["Content-Type"].startswith("text/css")
+        assert "immutable" in response["Cache-Control"]
+        assert "Accept-Encoding" in response["Vary"]
+
+    def test_unhashed_file_has_short_cache(self, collected):
+        """Test the original file name is not cached forever"""
+        response = self.client.get("/static/todos/css/style.css")
+
+        assert response.status_code == 200
+        assert "immutable" not in response["Cache-Control"]
+
+    def test_gzip_variant_is_negotiated(self, collected):
+        """Test the .gz variant is served when the client accepts gzip"""
+        root, paths = collected
+        name = paths["todos/css/style.css"]
+        response = self.client.get("/static/" + name, HTTP_ACCEPT_ENCODING="gzip")
+
+        assert response["Content-Encoding"] == "gzip"
+        body = b"".join(response.streaming_content)
+        assert gzip.decompress(body) == (root / name).read_bytes()
+
+    def test_refused_encoding_is_not_served(self, collected):
+        """Test q=0 in Accept-Encoding rules out the pre-compressed variant"""
+        _, paths = collected
+        response = self.client.get(
+            "/static/" + paths["todos/css/style.css"],
+            HTTP_ACCEPT_ENCODING="gzip;q=0, br;q=0, identity",
+        )
+
+        assert not response.has_header("Content-Encoding")
+
+    def test_missing_file_falls_through(self, collected):
+        """Test unknown static paths reach the normal URL resolver"""
+        response = self.client.get("/static/todos/css/missing.css")
+        assert response.status_code == 404
+
+    def test_path_traversal_is_rejected(self, collected):
+        """Test paths outside STATIC_ROOT are never served"""
+        response = self.client.get("/static/../core/settings.py")
+        assert response.status_code == 404
@@ -0,0 +1,42 @@
+from django.contrib import admin
+from django.db.models import Q
+from django.utils import timezone
+
+from .models import Job
+
+
+@admin.register(Job)
+class JobAdmin(admin.ModelAdmin):
+    list_display = (
+        "name",
+        "status",
+        "attempts",
+        "max_attempts",
+        "run_at",
+        "created_at",
+        "finished_at",
+    )
+    list_filter = ("status", "name")
+    search_fields = ("name", "last_error")
+    readonly_fields = ("attempts", "created_at", "started_at", "finished_at")
+    ordering = ("-created_at",)
+    actions = ("requeue",)
+
+    @admin.action(description="Requeue selected jobs")
+    def requeue(self, request, queryset):
+        """
+        Requeue finished jobs, and running jobs whose lease has expired.
+        Jobs still running within their lease are left alone so no two
+        workers run the same job.
+        """
+        count = queryset.filter(
+            Q(status__in=(Job.Status.FAILED, Job.Status.SUCCEEDED))
+            | Job.lease_expired()
+        ).update(
+            status=Job.Status.QUEUED,
+            attempts=0,
+            run_at=timezone.now(),
+            last_error="",
+            finished_at=None,
+        )
+        self.message_user(request, f"{count} job(s) requeued.")
@@ -0,0 +1,106 @@
+import multiprocessing
+import os
+import time
+from concurrent.futures import FIRST_COMPLETED, Future, ProcessPoolExecutor, wait
+from concurrent.futures.process import BrokenProcessPool
+
+from django.core.management.base import BaseCommand
+
+from jobs.queue import claim, fail_lost, run_job
+from jobs.worker import execute, init_process
+
+
+class Command(BaseCommand):
+    help = "Run queued jobs in a pool of worker processes."
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            "--processes",
+            type=int,
+            default=os.cpu_count() or 1,
+            help="Number of worker processes. 0 runs jobs in this process.",
+        )
+        parser.add_argument(
+            "--poll-interval",
+            type=float,
+            default=1.0,
+            help="Seconds to sleep when no job is due.",
+        )
+        parser.add_argument(
+            "--once",
+            action="store_true",
+            help="Exit once no job is due instead of polling forever.",
+        )
+
+    def handle(self, *args, processes, poll_interval, once, **options):
+        if processes == 0:
+            self.run_inline(poll_interval, once)
+            return
+
+        pool = self.start_pool(processes)
+        running = {}
+        try:
+            while True:
+                for pk in claim(processes - len(running)):
+                    running[self.submit(pool, pk)] = pk
+                if not running:
+                    if once:
+                        break
+                    time.sleep(poll_interval)
+                    continue
+                done, _ = wait(
+                    running, timeout=poll_interval, return_when=FIRST_COMPLETED
+                )
+                lost = []
+                for future in done:
+                    pk = running.pop(future)
+                    try:
+                        self.report(pk, future.result())
+                    except BrokenProcessPool:
+                        lost.append(pk)
+                    except Exception as exc:
+                        self.stderr.write(f"Job {pk}: worker error: {exc!r}")
+                if lost:
+                    # A dead worker breaks the whole pool and every job still
+                    # in flight with it: record the failed attempts so the
+                    # jobs are retried, then carry on with a fresh pool.
+                    lost.extend(running.values())
+                    running.clear()
+                    for pk in lost:
+                        fail_lost(pk, "Worker process died while running this job.")
+                        self.stderr.write(f"Job {pk}: worker process died")
+                    pool.shutdown(wait=False, cancel_futures=True)
+                    pool = self.start_pool(processes)
+        finally:
+            pool.shutdown()
+
+    def start_pool(self, processes):
+        # Workers are spawned rather than forked so they never share this
+        # process's database connection.
+        return ProcessPoolExecutor(
+            max_workers=processes,
+            mp_context=multiprocessing.get_context("spawn"),
+            initializer=init_process,
+        )
+
+    def submit(self, pool, pk):
+        try:
+            return pool.submit(execute, pk)
+        except BrokenProcessPool as exc:
+            # Report it like a job that was running when the pool broke.
+            future = Future()
+            future.set_exception(exc)
+            return future
+
+    def run_inline(self, poll_interval, once):
+        while True:
+            claimed = claim(1)
+            if not claimed:
+                if once:
+                    break
+                time.sleep(poll_interval)
+                continue
+            self.report(claimed[0], run_job(claimed[0]))
+
+    def report(self, pk, status):
+        self.stdout.write(f"Job {pk}: {status}")
@@ -0,0 +1,62 @@
+from datetime import timedelta
+
+from django.db import models
+from django.utils import timezone
+
+
+class Job(models.Model):
+    class Status(models.TextChoices):
+        QUEUED = "queued", "Queued"
+        RUNNING = "running", "Running"
+        SUCCEEDED = "succeeded", "Succeeded"
+        FAILED = "failed", "Failed"
+
+    name = models.CharField(max_length=200)
+    args = models.JSONField(default=list, blank=True)
+    kwargs = models.JSONField(default=dict, blank=True)
+    status = models.CharField(
+        max_length=20, choices=Status.choices, default=Status.QUEUED
+    )
+    attempts = models.PositiveIntegerField(default=0)
+    max_attempts = models.PositiveIntegerField(default=3)
+    run_at = models.DateTimeField(default=timezone.now)
+    last_error = models.TextField(blank=True)
+    created_at = models.DateTimeField(auto_now_add=True)
+    started_at = models.DateTimeField(null=True, blank=True)
+    finished_at = models.DateTimeField(null=True, blank=True)
+
+    retry_delay = timedelta(seconds=10)
+    # A running job not finished within this time is assumed lost with its
+    # worker and may be claimed again.
+    lease = timedelta(minutes=30)
+
+    class Meta:
+        ordering = ["run_at"]
+        indexes = [models.Index(fields=["status", "run_at"])]
+
+    def __str__(self):
+        return f"{self.name} ({self.status})"
+
+    @classmethod
+    def lease_expired(cls):
+        """Q matching running jobs whose lease has run out."""
+        return models.Q(
+            status=cls.Status.RUNNING, started_at__lt=timezone.now() - cls.lease
+        )
+
+    def succeed(self):
+        self.status = self.Status.SUCCEEDED
+        self.last_error = ""
+        self.finished_at = timezone.now()
+        self.save()
+
+    def fail(self, error):
+        """Record a failed attempt and schedule a retry if any are left."""
+        self.last_error = error
+        if self.attempts < self.max_attempts:
+            self.status = self.Status.QUEUED
+            self.run_at = timezone.now() + self.retry_delay * 2 ** (self.attempts - 1)
+        else:
+            self.status = self.Status.FAILED
+            self.finished_at = timezone.now()
+        self.save()
@@ -0,0 +1,96 @@
+import traceback
+
+from django.db.models import F, Q
+from django.utils import timezone
+from django.utils.module_loading import import_string
+
+from .models import Job
+
+
+def enqueue(func, *args, max_attempts=3, run_at=None, **kwargs):
+    """
+    Queue ``func(*args, **kwargs)`` to be run by ``manage.py run_worker``.
+
+    ``func`` is either a module-level callable or its dotted path. Arguments
+    are stored as JSON, so they must be JSON serializable. Raise
+    ``ValueError`` if the worker could not import ``func`` by name.
+    """
+    if isinstance(func, str):
+        name = func
+    else:
+        module = getattr(func, "__module__", "")
+        name = f"{module}.{getattr(func, '__qualname__', '')}"
+    # Methods, nested functions and lambdas have names the worker cannot
+    # import, so refuse them here rather than fail every attempt later.
+    try:
+        target = import_string(name)
+    except ImportError:
+        target = None
+    if not callable(target) or (not isinstance(func, str) and target is not func):
+        raise ValueError(f"{func!r} is not a module-level callable.")
+    return Job.objects.create(
+        name=name,
+        args=list(args),
+        kwargs=kwargs,
+        max_attempts=max_attempts,
+        run_at=run_at or timezone.now(),
+    )
+
+
+def claim(limit):
+    """
+    Mark up to ``limit`` due jobs as running and return their ids.
+
+    Due jobs are queued jobs whose ``run_at`` has passed, and running jobs
+    whose lease has expired because their worker died. Each job is claimed
+    with a conditional update, so concurrent workers never pick up the same
+    job.
+    """
+    now = timezone.now()
+    expire_leases()
+    due = Q(status=Job.Status.QUEUED, run_at__lte=now) | Job.lease_expired()
+    candidates = Job.objects.filter(due).values_list("pk", flat=True)[:limit]
+    claimed = []
+    for pk in candidates:
+        updated = Job.objects.filter(due, pk=pk).update(
+            status=Job.Status.RUNNING,
+            started_at=now,
+            attempts=F("attempts") + 1,
+        )
+        if updated:
+            claimed.append(pk)
+    return claimed
+
+
+def expire_leases():
+    """Fail expired running jobs that have no attempts left."""
+    return Job.objects.filter(
+        Job.lease_expired(), attempts__gte=F("max_attempts")
+    ).update(
+        status=Job.Status.FAILED,
+        last_error="Lease expired: the worker running this job was lost.",
+        finished_at=timezone.now(),
+    )
+
+
+def fail_lost(pk, error):
+    """
+    Record a failed attempt for a job whose worker process died, unless the
+    job finished before that.
+    """
+    job = Job.objects.get(pk=pk)
+    if job.status == Job.Status.RUNNING:
+        job.fail(error)
+
+
+def run_job(pk):
+    """Run a claimed job and record its outcome."""
+    job = Job.objects.get(pk=pk)
+    try:
+        func = import_string(job.name)
+        func(*job.args, **job.kwargs)
+    except Exception:
+        job.fail(traceback.format_exc())
+    else:
+        job.succeed()
+    return job.status
@@ -0,0 +1,217 @@
+import os
+from datetime import timedelta
+from io import StringIO
+
+import pytest
+from django.contrib import admin
+from django.core.management import call_command
+from django.utils import timezone
+from model_bakery import baker
+
+from jobs.admin import JobAdmin
+from jobs.management.commands import run_worker
+from jobs.models import Job
+from jobs.queue import claim, enqueue, run_job
+from todos.models import IdempotencyKey
+
+CALLS = []
+
+
+def record_call(*args, **kwargs):
+    CALLS.append((args, kwargs))
+
+
+def always_fail():
+    raise RuntimeError("boom")
+
+
+def crash_or_succeed(pk):
+    """Stand-in for ``jobs.worker.execute`` that kills its worker process."""
+    if str(pk) == os.environ["CRASH_JOB"]:
+        os._exit(1)
+    return Job.Status.SUCCEEDED
+
+
+@pytest.mark.django_db
+class TestQueue:
+    def setup_method(self):
+        CALLS.clear()
+
+    def test_enqueue_callable(self):
+        """Test enqueue stores the dotted path and arguments"""
+        job = enqueue(record_call, 1, "two", key="value")
+
+        assert job.name == "jobs.tests.test_queue.record_call"
+        assert job.args == [1, "two"]
+        assert job.kwargs == {"key": "value"}
+        assert job.status == Job.Status.QUEUED
+
+    def test_enqueue_dotted_path(self):
+        """Test enqueue accepts the dotted path of a module-level callable"""
+        job = enqueue("jobs.tests.test_queue.record_call")
+
+        assert job.name == "jobs.tests.test_queue.record_call"
+
+    @pytest.mark.parametrize(
+        "func",
+        [
+            IdempotencyKey.purge_expired,
+            lambda: None,
+            "jobs.tests.test_queue.missing",
+            "jobs.tests.test_queue.CALLS",
+        ],
+    )
+    def test_enqueue_rejects_unimportable_callables(self, func):
+        """Test enqueue refuses callables the worker cannot import by name"""
+        with pytest.raises(ValueError):
+            enqueue(func)
+
+        assert not Job.objects.exists()
+
+    def test_claim_marks_jobs_running(self):
+        """Test claimed jobs are not handed out twice"""
+        job = enqueue(record_call)
+
+        assert claim(10) == [job.pk]
+        assert claim(10) == []
+
+        job.refresh_from_db()
+        assert job.status == Job.Status.RUNNING
+        assert job.attempts == 1
+
+    def test_claim_skips_future_jobs(self):
+        """Test jobs scheduled for later are not claimed yet"""
+        enqueue(record_call, run_at=timezone.now() + timedelta(hours=1))
+        assert claim(10) == []
+
+    def test_run_job_success(self):
+        """Test a successful job runs its callable once"""
+        job = enqueue(record_call, 1, key="value")
+        claim(1)
+
+        assert run_job(job.pk) == Job.Status.SUCCEEDED
+        assert CALLS == [((1,), {"key": "value"})]
+
+        job.refresh_from_db()
+        assert job.finished_at is not None
+
+    def test_failed_job_is_retried_later(self):
+        """Test a failure with attempts left is requeued with a delay"""
+        job = enqueue(always_fail, max_attempts=2)
+        claim(1)
+
+        assert run_job(job.pk) == Job.Status.QUEUED
+        job.refresh_from_db()
+        assert "RuntimeError: boom" in job.last_error
+        assert job.run_at > timezone.now()
+
+    def test_failed_job_gives_up_after_max_attempts(self):
+        """Test a job is marked failed once its attempts are used up"""
+        job = enqueue(always_fail, max_attempts=1)
+        claim(1)
+
+        assert run_job(job.pk) == Job.Status.FAILED
+
+    def expire_lease(self, job):
+        Job.objects.filter(pk=job.pk).update(
+            started_at=timezone.now() - Job.lease - timedelta(seconds=1)
+        )
+
+    def test_claim_takes_back_expired_lease(self):
+        """Test a running job whose worker was lost is claimed again"""
+        job = enqueue(record_call)
+        claim(1)
+        self.expire_lease(job)
+
+        assert claim(1) == [job.pk]
+        job.refresh_from_db()
+        assert job.status == Job.Status.RUNNING
+        assert job.attempts == 2
+
+    def test_claim_skips_running_job_within_lease(self):
+        """Test a running job is not claimed while its lease holds"""
+        enqueue(record_call)
+        claim(1)
+
+        assert claim(1) == []
+
+    def test_expired_lease_without_attempts_fails_job(self):
+        """Test a lost job with no attempts left is failed, not rerun"""
+        job = enqueue(record_call, max_attempts=1)
+        claim(1)
+        self.expire_lease(job)
+
+        assert claim(1) == []
+        job.refresh_from_db()
+        assert job.status == Job.Status.FAILED
+        assert "Lease expired" in job.last_error
+
+
+@pytest.mark.django_db
+class TestJobAdmin:
+    def test_requeue_skips_jobs_within_lease(self, rf):
+        """Test requeue resets finished jobs but leaves running ones alone"""
+        failed = baker.make(
+            Job,
+            status=Job.Status.FAILED,
+            attempts=3,
+            last_error="boom",
+            finished_at=timezone.now(),
+        )
+        running = baker.make(
+            Job, status=Job.Status.RUNNING, attempts=1, started_at=timezone.now()
+        )
+        job_admin = JobAdmin(Job, admin.site)
+        job_admin.message_user = lambda request, message: None
+
+        job_admin.requeue(rf.get("/"), Job.objects.all())
+
+        failed.refresh_from_db()
+        assert failed.status == Job.Status.QUEUED
+        assert failed.attempts == 0
+        assert failed.last_error == ""
+        assert failed.finished_at is None
+        running.refresh_from_db()
+        assert running.status == Job.Status.RUNNING
+
+
+@pytest.mark.django_db
+class TestRunWorkerCommand:
+    def setup_method(self):
+        CALLS.clear()
+
+    def test_run_worker_once_inline(self):
+        """Test the worker drains due jobs and exits with --once"""
+        first = enqueue(record_call, 1)
+        second = enqueue(record_call, 2)
+        out = StringIO()
+
+        call_command("run_worker", processes=0, once=True, stdout=out)
+
+        assert CALLS == [((1,), {}), ((2,), {})]
+        assert f"Job {first.pk}: succeeded" in out.getvalue()
+        assert f"Job {second.pk}: succeeded" in out.getvalue()
+
+    def test_run_worker_survives_dead_process(self, monkeypatch):
+        """Test a crashed worker process fails its job and the pool recovers"""
+        crash = enqueue(record_call)
+        healthy = enqueue(record_call)
+        monkeypatch.setenv("CRASH_JOB", str(crash.pk))
+        monkeypatch.setattr(run_worker, "execute", crash_or_succeed)
+        out, err = StringIO(), StringIO()
+
+        call_command(
+            "run_worker",
+            processes=1,
+            once=True,
+            poll_interval=0.1,
+            stdout=out,
+            stderr=err,
+        )
+
+        assert f"Job {crash.pk}: worker process died" in err.getvalue()
+        assert f"Job {healthy.pk}: succeeded" in out.getvalue()
+        crash.refresh_from_db()
+        assert crash.status == Job.Status.QUEUED
+        assert crash.attempts == 1
+        assert "Worker process died" in crash.last_error
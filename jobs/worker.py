@@ -0,0 +1,20 @@
+"""
+Entry points for worker processes started by ``manage.py run_worker``.
+
+Spawned processes import this module before Django is set up, so it must
+not import models at module level.
+"""
+
+import django
+from django.db import connections
+
+
+def init_process():
+    django.setup()
+    connections.close_all()
+
+
+def execute(pk):
+    from .queue import run_job
+
+    return run_job(pk)
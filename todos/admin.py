@@ -1,5 +1,5 @@
 from django.contrib import admin
-from .models import Task
+from .models import ArchivedTask, Task
 
 
 @admin.register(Task)
@@ -9,3 +9,12 @@ class TaskAdmin(admin.ModelAdmin):
     search_fields = ("title", "description")
     readonly_fields = ("created_at", "updated_at")
     ordering = ("-created_at",)
+
+
+@admin.register(ArchivedTask)
+class ArchivedTaskAdmin(admin.ModelAdmin):
+    list_display = ("title", "created_at", "updated_at", "archived_at")
+    list_filter = ("archived_at",)
+    search_fields = ("title", "description")
+    readonly_fields = ("created_at", "updated_at", "archived_at")
+    ordering = ("-archived_at",)
@@ -0,0 +1,29 @@
+from datetime import timedelta
+
+from django.core.management.base import BaseCommand
+from django.utils import timezone
+
+from todos.models import ArchivedTask
+
+
+class Command(BaseCommand):
+    help = "Move tasks completed more than --days ago into the archive table."
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            "--days",
+            type=int,
+            default=30,
+            help="Archive tasks completed more than this many days ago.",
+        )
+        parser.add_argument(
+            "--batch-size",
+            type=int,
+            default=500,
+            help="Number of tasks moved per transaction.",
+        )
+
+    def handle(self, *args, days, batch_size, **options):
+        before = timezone.now() - timedelta(days=days)
+        archived = ArchivedTask.archive_completed(before, batch_size=batch_size)
+        self.stdout.write(f"Archived {archived} task(s).")
@@ -0,0 +1,168 @@
+import json
+import os
+import re
+import statistics
+import subprocess
+import sys
+from collections import defaultdict
+
+from django.conf import settings
+from django.core.management.base import BaseCommand, CommandError
+
+# Runs in a fresh interpreter: import the application module, then send it
+# one request and report the timings in milliseconds as JSON on stdout.
+# core.preload.preload() is timed on its own and left out of the import time.
+CHILD = """
+import json, sys, time
+
+preloads = []
+start = time.perf_counter()
+from django.conf import settings
+
+if getattr(settings, "PRELOAD_ON_STARTUP", False):
+    import core.preload
+
+    def timed_preload(preload=core.preload.preload):
+        began = time.perf_counter()
+        try:
+            return preload()
+        finally:
+            preloads.append(time.perf_counter() - began)
+
+    core.preload.preload = timed_preload
+
+module = __import__(sys.argv[1], fromlist=["application"])
+imported = time.perf_counter()
+preload = sum(preloads)
+application, path = module.application, sys.argv[2]
+
+if sys.argv[1].endswith("asgi"):
+    import asyncio
+
+    scope = {
+        "type": "http", "asgi": {"version": "3.0"}, "http_version": "1.1",
+        "method": "GET", "scheme": "http", "path": path, "raw_path": path.encode(),
+        "query_string": b"", "headers": [(b"host", b"localhost")],
+        "client": ("127.0.0.1", 0), "server": ("localhost", 80),
+    }
+    status = []
+    requests = [{"type": "http.request", "body": b"", "more_body": False}]
+
+    async def receive():
+        if requests:
+            return requests.pop()
+        # The client never disconnects.
+        await asyncio.Event().wait()
+
+    async def send(message):
+        if message["type"] == "http.response.start" and not status:
+            status.append((message["status"], time.perf_counter()))
+
+    asyncio.run(application(scope, receive, send))
+    code, responded = status[0]
+else:
+    from wsgiref.util import setup_testing_defaults
+
+    environ = {"PATH_INFO": path, "HTTP_HOST": "localhost"}
+    setup_testing_defaults(environ)
+    result = []
+
+    def start_response(status, headers, exc_info=None):
+        result.append((int(status.split()[0]), time.perf_counter()))
+
+    body = application(environ, start_response)
+    next(iter(body), None)
+    code, responded = result[0]
+
+print(json.dumps({
+    "import_ms": (imported - start - preload) * 1000,
+    "preload_ms": preload * 1000 if preloads else None,
+    "first_response_ms": (responded - imported) * 1000,
+    "status": code,
+}))
+"""
+
+re_importtime = re.compile(r"import time:\s+(\d+) \|\s+\d+ \|\s+(\S+)")
+
+
+class Command(BaseCommand):
+    help = (
+        "Measure cold start of the WSGI/ASGI application in fresh interpreters: "
+        "import time by package and time to first response."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            "--module",
+            choices=["core.wsgi", "core.asgi"],
+            default="core.wsgi",
+            help="Application module to import.",
+        )
+        parser.add_argument(
+            "--path", default="/", help="Path requested for the first response."
+        )
+        parser.add_argument(
+            "--runs", type=int, default=5, help="Cold starts to take the median of."
+        )
+        parser.add_argument(
+            "--top", type=int, default=15, help="Number of packages to list."
+        )
+
+    def handle(self, *args, module, path, runs, top, **options):
+        if runs < 1:
+            raise CommandError("--runs must be at least 1.")
+        env = {**os.environ, "DJANGO_SETTINGS_MODULE": settings.SETTINGS_MODULE}
+
+        results = [self.run_child(module, path, env)[0] for _ in range(runs)]
+        self.stdout.write(f"Settings: {settings.SETTINGS_MODULE}")
+        self.stdout.write(f"Application: {module}.application")
+        self.stdout.write(f"First response: GET {path} -> {results[0]['status']}")
+        for key, label in (
+            ("import_ms", "Import"),
+            ("preload_ms", "Preload"),
+            ("first_response_ms", "First response after import"),
+        ):
+            if results[0][key] is None:
+                self.stdout.write(f"{label}: off (PRELOAD_ON_STARTUP is not set)")
+                continue
+            median = statistics.median(result[key] for result in results)
+            self.stdout.write(f"{label}: {median:.1f} ms (median of {runs})")
+
+        if not top:
+            return
+        self.stdout.write("")
+        self.stdout.write(f"Import self time by package (top {top}):")
+        for package, micros in self.import_breakdown(module, path, env)[:top]:
+            self.stdout.write(f"{micros / 1000:10.1f} ms  {package}")
+
+    def run_child(self, module, path, env, *flags):
+        completed = subprocess.run(
+            [sys.executable, *flags, "-c", CHILD, module, path],
+            env=env,
+            capture_output=True,
+            text=True,
+        )
+        if completed.returncode:
+            raise CommandError(f"Cold start failed:\n{completed.stderr}")
+        return json.loads(completed.stdout.splitlines()[-1]), completed.stderr
+
+    def import_breakdown(self, module, path, env):
+        """
+        Re-run one cold start under ``-X importtime`` and sum the self time
+        of every imported module per package, e.g. ``django.contrib.admin``.
+        Imports done while serving the first request (URLconfs, views) are
+        included.
+        """
+        _, stderr = self.run_child(module, path, env, "-X", "importtime")
+        totals = defaultdict(int)
+        for line in stderr.splitlines():
+            match = re_importtime.match(line)
+            if match:
+                self_time, name = match.groups()
+                totals[self.package(name)] += int(self_time)
+        return sorted(totals.items(), key=lambda item: item[1], reverse=True)
+
+    def package(self, name):
+        parts = name.split(".")
+        depth = 3 if parts[:2] == ["django", "contrib"] else 2
+        return ".".join(parts[:depth])
@@ -0,0 +1,11 @@
+from django.core.management.base import BaseCommand
+
+from todos.tasks import purge_idempotency_keys
+
+
+class Command(BaseCommand):
+    help = "Delete idempotency keys older than TODOS_IDEMPOTENCY_KEY_TTL."
+
+    def handle(self, *args, **options):
+        deleted = purge_idempotency_keys()
+        self.stdout.write(f"Deleted {deleted} expired idempotency key(s).")
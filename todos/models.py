@@ -1,5 +1,9 @@
-from django.db import models
+from datetime import timedelta
+
+from django.conf import settings
+from django.db import models, transaction
 from django.urls import reverse
+from django.utils import timezone
 
 
 class Task(models.Model):
@@ -9,6 +13,8 @@ class Task(models.Model):
     created_at = models.DateTimeField(auto_now_add=True)
     updated_at = models.DateTimeField(auto_now=True)
 
+    is_archived = False
+
     class Meta:
         ordering = ["-created_at"]
 
@@ -17,3 +23,93 @@ class Task(models.Model):
 
     # def get_absolute_url(self):
     #     return reverse("task_detail", kwargs={"pk": self.pk})
+
+
+class IdempotencyKey(models.Model):
+    """A form submission that has already been processed."""
+
+    key = models.CharField(max_length=32, unique=True)
+    created_at = models.DateTimeField(auto_now_add=True, db_index=True)
+
+    def __str__(self):
+        return self.key
+
+    @classmethod
+    def purge_expired(cls):
+        cutoff = timezone.now() - timedelta(seconds=settings.TODOS_IDEMPOTENCY_KEY_TTL)
+        deleted, _ = cls.objects.filter(created_at__lt=cutoff).delete()
+        return deleted
+
+
+class ArchivedTask(models.Model):
+    """
+    A completed task moved out of the task table by ``archive_tasks``.
+
+    The primary key is the original task's, so links keep working and the
+    task can be restored under the same id.
+    """
+
+    id = models.BigIntegerField(primary_key=True)
+    title = models.CharField(max_length=200)
+    description = models.TextField(blank=True)
+    is_complete = models.BooleanField(default=True)
+    created_at = models.DateTimeField()
+    updated_at = models.DateTimeField()
+    archived_at = models.DateTimeField(auto_now_add=True)
+
+    is_archived = True
+
+    class Meta:
+        ordering = ["-created_at"]
+
+    def __str__(self):
+        return self.title
+
+    @classmethod
+    def archive_completed(cls, before, batch_size=500):
+        """
+        Move tasks completed (last updated) before ``before`` into the
+        archive, ``batch_size`` rows per transaction. Return the number of
+        tasks archived.
+        """
+        archived = 0
+        while True:
+            with transaction.atomic():
+                batch = list(
+                    Task.objects.select_for_update()
+                    .filter(is_complete=True, updated_at__lt=before)
+                    .order_by("pk")[:batch_size]
+                )
+                if not batch:
+                    return archived
+                cls.objects.bulk_create(
+                    cls(
+                        id=task.pk,
+                        title=task.title,
+                        description=task.description,
+                        is_complete=task.is_complete,
+                        created_at=task.created_at,
+                        updated_at=task.updated_at,
+                    )
+                    for task in batch
+                )
+                Task.objects.filter(pk__in=[task.pk for task in batch]).delete()
+            archived += len(batch)
+
+    def restore(self):
+        """Move this task back into the task table and return it."""
+        with transaction.atomic():
+            task = Task.objects.create(
+                id=self.id,
+                title=self.title,
+                description=self.description,
+                is_complete=self.is_complete,
+            )
+            # update() skips auto_now/auto_now_add, keeping the original dates.
+            Task.objects.filter(pk=task.pk).update(
+                created_at=self.created_at, updated_at=self.updated_at
+            )
+            self.delete()
+        task.created_at = self.created_at
+        task.updated_at = self.updated_at
+        return task
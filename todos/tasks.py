@@ -0,0 +1,8 @@
+"""Functions to run in the background with ``jobs.queue.enqueue``."""
+
+from .models import IdempotencyKey
+
+
+def purge_idempotency_keys():
+    """Delete idempotency keys older than ``TODOS_IDEMPOTENCY_KEY_TTL``."""
+    return IdempotencyKey.purge_expired()
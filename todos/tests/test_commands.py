@@ -0,0 +1,46 @@
+from datetime import timedelta
+from io import StringIO
+
+import pytest
+from django.core.management import CommandError, call_command
+from django.utils import timezone
+from model_bakery import baker
+from todos.models import ArchivedTask, Task
+
+
+@pytest.mark.django_db
+class TestArchiveTasksCommand:
+    def test_archive_tasks(self):
+        """Test the command archives tasks completed more than --days ago"""
+        old = baker.make(Task, is_complete=True)
+        recent = baker.make(Task, is_complete=True)
+        Task.objects.filter(pk=old.pk).update(
+            updated_at=timezone.now() - timedelta(days=10)
+        )
+        out = StringIO()
+
+        call_command("archive_tasks", days=7, batch_size=10, stdout=out)
+
+        assert "Archived 1 task(s)." in out.getvalue()
+        assert list(Task.objects.all()) == [recent]
+        assert ArchivedTask.objects.filter(pk=old.pk).exists()
+
+
+class TestBenchStartupCommand:
+    def test_bench_startup(self):
+        """Test the command reports cold start timings and an import breakdown"""
+        out = StringIO()
+
+        call_command("bench_startup", path="/missing/", runs=1, top=3, stdout=out)
+
+        output = out.getvalue()
+        assert "First response: GET /missing/ -> 404" in output
+        assert "Import: " in output
+        assert "Preload: off" in output
+        assert "First response after import: " in output
+        assert "Import self time by package (top 3):" in output
+
+    def test_bench_startup_needs_a_run(self):
+        """Test the command refuses to take a median of no runs"""
+        with pytest.raises(CommandError):
+            call_command("bench_startup", runs=0)
@@ -1,7 +1,10 @@
+from datetime import timedelta
+
 import pytest
 from model_bakery import baker
 from django.urls import reverse
-from todos.models import Task
+from django.utils import timezone
+from todos.models import ArchivedTask, IdempotencyKey, Task
 
 
 @pytest.mark.django_db
@@ -33,3 +36,68 @@ class TestTaskModel:
     #     task = baker.make(Task)
     #     expected_url = reverse("task_detail", kwargs={"pk": task.pk})
     #     assert task.get_absolute_url() == expected_url
+
+
+@pytest.mark.django_db
+class TestIdempotencyKeyModel:
+    def test_purge_expired(self, settings):
+        """Test only keys older than the TTL are purged"""
+        settings.TODOS_IDEMPOTENCY_KEY_TTL = 60
+        old = baker.make(IdempotencyKey, key="a" * 32)
+        fresh = baker.make(IdempotencyKey, key="b" * 32)
+        IdempotencyKey.objects.filter(pk=old.pk).update(
+            created_at=timezone.now() - timedelta(seconds=120)
+        )
+
+        assert IdempotencyKey.purge_expired() == 1
+        assert list(IdempotencyKey.objects.all()) == [fresh]
+
+
+@pytest.mark.django_db
+class TestArchivedTaskModel:
+    def make_task(self, days_ago, is_complete=True, **kwargs):
+        task = baker.make(Task, is_complete=is_complete, **kwargs)
+        Task.objects.filter(pk=task.pk).update(
+            updated_at=timezone.now() - timedelta(days=days_ago)
+        )
+        task.refresh_from_db()
+        return task
+
+    def test_archive_completed_moves_old_completed_tasks(self):
+        """Test only old completed tasks leave the task table"""
+        old_done = self.make_task(40, title="Old done")
+        old_open = self.make_task(40, is_complete=False)
+        recent_done = self.make_task(1)
+
+        before = timezone.now() - timedelta(days=30)
+        assert ArchivedTask.archive_completed(before, batch_size=1) == 1
+
+        assert set(Task.objects.all()) == {old_open, recent_done}
+        archived = ArchivedTask.objects.get(pk=old_done.pk)
+        assert archived.title == "Old done"
+        assert archived.created_at == old_done.created_at
+        assert archived.updated_at == old_done.updated_at
+
+    def test_archive_completed_in_batches(self):
+        """Test every matching task is archived across several batches"""
+        for _ in range(5):
+            self.make_task(40)
+
+        before = timezone.now() - timedelta(days=30)
+        assert ArchivedTask.archive_completed(before, batch_size=2) == 5
+        assert Task.objects.count() == 0
+        assert ArchivedTask.objects.count() == 5
+
+    def test_restore_keeps_id_and_dates(self):
+        """Test restoring brings the task back unchanged"""
+        task = self.make_task(40, title="Restore me")
+        ArchivedTask.archive_completed(timezone.now() - timedelta(days=30))
+
+        restored = ArchivedTask.objects.get(pk=task.pk).restore()
+
+        assert restored.pk == task.pk
+        assert not ArchivedTask.objects.exists()
+        reloaded = Task.objects.get(pk=task.pk)
+        assert reloaded.title == "Restore me"
+        assert reloaded.created_at == task.created_at
+        assert reloaded.updated_at == task.updated_at
@@ -0,0 +1,27 @@
+from datetime import timedelta
+
+import pytest
+from django.utils import timezone
+from model_bakery import baker
+
+from jobs.models import Job
+from jobs.queue import claim, enqueue, run_job
+from todos.models import IdempotencyKey
+from todos.tasks import purge_idempotency_keys
+
+
+@pytest.mark.django_db
+class TestTasks:
+    def test_purge_idempotency_keys_runs_from_queue(self, settings):
+        """Test the purge can be enqueued and run by a worker"""
+        settings.TODOS_IDEMPOTENCY_KEY_TTL = 60
+        old = baker.make(IdempotencyKey, key="a" * 32)
+        IdempotencyKey.objects.filter(pk=old.pk).update(
+            created_at=timezone.now() - timedelta(seconds=120)
+        )
+        job = enqueue(purge_idempotency_keys)
+        claim(1)
+
+        assert job.name == "todos.tasks.purge_idempotency_keys"
+        assert run_job(job.pk) == Job.Status.SUCCEEDED
+        assert not IdempotencyKey.objects.exists()
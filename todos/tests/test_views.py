@@ -1,8 +1,14 @@
+import uuid
+from datetime import timedelta
+
 import pytest
 from django.test import Client
 from django.urls import reverse
+from django.utils import timezone
 from model_bakery import baker
-from todos.models import Task
+from todos.models import ArchivedTask, IdempotencyKey, Task
+from todos import views
+from todos.views import TaskListView
 
 
 @pytest.mark.django_db
@@ -132,6 +138,225 @@ class TestTaskListView:
         assert 'value="Important"' in response.content.decode()
 
 
+@pytest.mark.django_db
+class TestArchivedTasks:
+    def setup_method(self):
+        self.client = Client()
+        self.list_url = reverse("task_list")
+
+    def archive(self, **kwargs):
+        task = baker.make(Task, is_complete=True, **kwargs)
+        ArchivedTask.archive_completed(timezone.now() + timedelta(seconds=1))
+        return task
+
+    def test_list_skips_archived_by_default(self):
+        """Test archived tasks are hidden from the default list"""
+        self.archive(title="Old Task")
+        baker.make(Task, title="Current Task")
+
+        content = self.client.get(self.list_url).content.decode()
+        assert "Current Task" in content
+        assert "Old Task" not in content
+
+    def test_list_includes_archived_on_request(self):
+        """Test the include archived option lists archived tasks too"""
+        self.archive(title="Old Task")
+        baker.make(Task, title="Current Task")
+
+        content = self.client.get(self.list_url, {"archived": "1"}).content.decode()
+        assert "Current Task" in content
+        assert "Old Task" in content
+        assert "(archived)" in content
+        assert 'name="archived" value="1" checked' in content
+
+    def test_search_includes_archived_on_request(self):
+        """Test search applies to archived tasks when they are included"""
+        self.archive(title="Important Old")
+        self.archive(title="Unrelated Old")
+
+        response = self.client.get(
+            self.list_url, {"search": "Important", "archived": "1"}
+        )
+        content = response.content.decode()
+        assert "Important Old" in content
+        assert "Unrelated Old" not in content
+
+    def test_streamed_list_includes_archived(self, settings):
+        """Test streaming mode also lists archived tasks on request"""
+        settings.TODOS_STREAM_TASK_LIST = True
+        self.archive(title="Old Task")
+
+        response = self.client.get(self.list_url, {"archived": "1"})
+        content = b"".join(response.streaming_content).decode()
+        assert "Old Task" in content
+
+    @pytest.mark.parametrize("stream", [False, True])
+    def test_archived_tasks_are_interleaved_by_age(self, settings, stream):
+        """Test live and archived tasks are listed newest first together"""
+        settings.TODOS_STREAM_TASK_LIST = stream
+        for days_ago, title in [(3, "Oldest Archived"), (1, "Newest Archived")]:
+            task = self.archive(title=title)
+            ArchivedTask.objects.filter(pk=task.pk).update(
+                created_at=timezone.now() - timedelta(days=days_ago)
+            )
+        live = baker.make(Task, title="Middle Live")
+        Task.objects.filter(pk=live.pk).update(
+            created_at=timezone.now() - timedelta(days=2)
+        )
+
+        response = self.client.get(self.list_url, {"archived": "1"})
+        if stream:
+            content = b"".join(response.streaming_content).decode()
+        else:
+            content = response.content.decode()
+        positions = [
+            content.index(title)
+            for title in ["Newest Archived", "Middle Live", "Oldest Archived"]
+        ]
+        assert positions == sorted(positions)
+
+    def test_detail_shows_archived_task(self):
+        """Test archived tasks are still reachable by id"""
+        task = self.archive(title="Old Task")
+
+        response = self.client.get(reverse("task_detail", kwargs={"pk": task.pk}))
+        assert response.status_code == 200
+        assert "Old Task" in response.content.decode()
+        assert ArchivedTask.objects.filter(pk=task.pk).exists()
+
+    def test_toggle_restores_archived_task(self):
+        """Test changing an archived task moves it back transparently"""
+        task = self.archive(title="Old Task")
+
+        self.client.post(reverse("task_toggle", kwargs={"pk": task.pk}))
+
+        restored = Task.objects.get(pk=task.pk)
+        assert restored.is_complete is False
+        assert not ArchivedTask.objects.exists()
+
+    def test_edit_restores_archived_task(self):
+        """Test editing an archived task moves it back transparently"""
+        task = self.archive(title="Old Task")
+
+        self.client.post(
+            reverse("task_edit", kwargs={"pk": task.pk}),
+            {"title": "Revived Task", "is_complete": "on"},
+        )
+
+        assert Task.objects.get(pk=task.pk).title == "Revived Task"
+        assert not ArchivedTask.objects.exists()
+
+    def archive_after_first_fetch(self, monkeypatch):
+        """Archive tasks right after the view first fetches one"""
+        fetch = views.get_task_or_404
+        fetched = []
+
+        def fetch_then_archive(pk):
+            task = fetch(pk)
+            if not fetched:
+                ArchivedTask.archive_completed(timezone.now() + timedelta(seconds=1))
+            fetched.append(pk)
+            return task
+
+        monkeypatch.setattr(views, "get_task_or_404", fetch_then_archive)
+
+    def test_toggle_racing_archive_keeps_one_copy(self, monkeypatch):
+        """Test a task archived mid-toggle is restored, not duplicated"""
+        task = baker.make(Task, is_complete=True)
+        self.archive_after_first_fetch(monkeypatch)
+
+        self.client.post(reverse("task_toggle", kwargs={"pk": task.pk}))
+
+        assert Task.objects.get(pk=task.pk).is_complete is False
+        assert not ArchivedTask.objects.exists()
+
+    def test_edit_racing_archive_keeps_one_copy(self, monkeypatch):
+        """Test a task archived mid-edit is restored, not duplicated"""
+        task = baker.make(Task, is_complete=True)
+        self.archive_after_first_fetch(monkeypatch)
+
+        self.client.post(
+            reverse("task_edit", kwargs={"pk": task.pk}),
+            {"title": "Edited Task", "is_complete": "on"},
+        )
+
+        assert Task.objects.get(pk=task.pk).title == "Edited Task"
+        assert not ArchivedTask.objects.exists()
+
+    def test_delete_archived_task(self):
+        """Test archived tasks can be deleted directly"""
+        task = self.archive()
+
+        self.client.post(reverse("task_delete", kwargs={"pk": task.pk}))
+
+        assert not ArchivedTask.objects.exists()
+        assert not Task.objects.exists()
+
+
+@pytest.mark.django_db
+class TestTaskListStreaming:
+    @pytest.fixture(autouse=True)
+    def enable_streaming(self, settings, monkeypatch):
+        settings.TODOS_STREAM_TASK_LIST = True
+        monkeypatch.setattr(TaskListView, "stream_chunk_size", 2)
+
+    def setup_method(self):
+        self.client = Client()
+        self.url = reverse("task_list")
+
+    def test_streams_page_in_chunks(self):
+        """Test the page is streamed as head, row chunks and tail"""
+        baker.make(Task, _quantity=5)
+
+        response = self.client.get(self.url)
+        assert response.status_code == 200
+        assert response.streaming
+
+        chunks = [chunk.decode() for chunk in response.streaming_content]
+        assert "search-form" in chunks[0]
+        assert "<tr>" not in chunks[0].split("<tbody>")[1]
+        assert [chunk.count("<tr>") for chunk in chunks[1:-1]] == [2, 2, 1]
+        assert "</table>" in chunks[-1]
+
+    def test_streamed_page_matches_rendered_rows(self):
+        """Test streamed rows keep order and content"""
+        first = baker.make(Task, title="First Task")
+        second = baker.make(Task, title="Second Task")
+
+        response = self.client.get(self.url)
+        content = b"".join(response.streaming_content).decode()
+        assert content.index(second.title) < content.index(first.title)
+        assert f'href="{reverse("task_edit", kwargs={"pk": first.pk})}"' in content
+        assert "csrfmiddlewaretoken" in content
+        assert "csrftoken" in response.cookies
+
+    def test_streamed_empty_list(self):
+        """Test the empty message is streamed when there are no tasks"""
+        response = self.client.get(self.url)
+        content = b"".join(response.streaming_content).decode()
+        assert "No tasks available" in content
+
+    def test_streamed_search(self):
+        """Test search still filters rows in streaming mode"""
+        baker.make(Task, title="Important Meeting")
+        baker.make(Task, title="Buy Groceries")
+
+        response = self.client.get(self.url, {"search": "Important"})
+        content = b"".join(response.streaming_content).decode()
+        assert "Important Meeting" in content
+        assert "Buy Groceries" not in content
+
+    def test_streamed_page_consumes_messages(self):
+        """Test flash messages are shown once in streaming mode"""
+        task = baker.make(Task, title="Flash Task")
+        self.client.post(reverse("task_toggle", kwargs={"pk": task.pk}))
+
+        first = b"".join(self.client.get(self.url).streaming_content).decode()
+        second = b"".join(self.client.get(self.url).streaming_content).decode()
+        assert "marked as complete" in first
+        assert "marked as complete" not in second
+
+
 @pytest.mark.django_db
 class TestTaskCreateView:
     def setup_method(self):
@@ -173,6 +398,56 @@ class TestTaskCreateView:
         assert response.status_code == 200
         assert ">Some description</textarea>" in response.content.decode()
 
+    def test_create_form_has_idempotency_key(self):
+        """Test the form carries a fresh idempotency key"""
+        first = self.client.get(self.url).context["idempotency_key"]
+        second = self.client.get(self.url).context["idempotency_key"]
+
+        assert first != second
+        content = self.client.get(self.url).content.decode()
+        assert 'name="idempotency_key"' in content
+
+    def test_replayed_submission_creates_one_task(self):
+        """Test resubmitting the same key redirects without a second insert"""
+        key = uuid.uuid4().hex
+        data = {"title": "New Task", "idempotency_key": key}
+
+        first = self.client.post(self.url, data)
+        second = self.client.post(self.url, data)
+
+        assert first.status_code == second.status_code == 302
+        assert second.url == first.url == reverse("task_list")
+        assert Task.objects.count() == 1
+        assert IdempotencyKey.objects.filter(key=key).exists()
+
+    def test_distinct_keys_create_distinct_tasks(self):
+        """Test separate form loads still create separate tasks"""
+        for _ in range(2):
+            data = {"title": "New Task", "idempotency_key": uuid.uuid4().hex}
+            self.client.post(self.url, data)
+
+        assert Task.objects.count() == 2
+
+    def test_validation_error_does_not_consume_key(self):
+        """Test a key is only recorded once a task is created"""
+        key = uuid.uuid4().hex
+        response = self.client.post(self.url, {"title": "", "idempotency_key": key})
+
+        assert response.context["idempotency_key"] == key
+        assert not IdempotencyKey.objects.exists()
+
+        self.client.post(self.url, {"title": "Fixed", "idempotency_key": key})
+        assert Task.objects.filter(title="Fixed").exists()
+
+    def test_malformed_key_is_ignored(self):
+        """Test an invalid key neither blocks nor gets stored"""
+        data = {"title": "New Task", "idempotency_key": "not-a-key"}
+        self.client.post(self.url, data)
+        self.client.post(self.url, data)
+
+        assert Task.objects.count() == 2
+        assert not IdempotencyKey.objects.exists()
+
 
 @pytest.mark.django_db
 class TestTaskDetailView:
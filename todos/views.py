@@ -1,65 +1,186 @@
+import heapq
+import re
+import uuid
+from operator import attrgetter
+
 from django.views import View
 from django.shortcuts import render, redirect
 from django.contrib import messages
-from .models import Task
+from .models import ArchivedTask, IdempotencyKey, Task
 from django.shortcuts import get_object_or_404
 from django.db.models import Q
-from django.http import HttpResponseNotAllowed
+from django.http import HttpResponseNotAllowed, StreamingHttpResponse
+from django.conf import settings
+from django.middleware.csrf import get_token
+from django.template.loader import get_template, render_to_string
+from django.db import DatabaseError, transaction
+
+re_idempotency_key = re.compile(r"[0-9a-f]{32}")
+
+
+def get_task_or_404(pk):
+    """
+    Return the task with ``pk``, falling back to the archive. Callers that
+    change the task restore an archived one first.
+    """
+    try:
+        return Task.objects.get(pk=pk)
+    except Task.DoesNotExist:
+        return get_object_or_404(ArchivedTask, pk=pk)
+
+
+def save_task(task, change):
+    """
+    Apply ``change(task)`` and save the task, restoring it from the archive
+    first. Return the saved task.
+
+    ``archive_tasks`` may move the task between fetching and saving it. The
+    forced update then fails instead of inserting a second copy next to the
+    archived one, and the change is applied again to a fresh fetch.
+    """
+    try:
+        # A savepoint, so a failed attempt doesn't break an outer transaction.
+        with transaction.atomic():
+            return _save_task(task, change)
+    except DatabaseError:
+        return _save_task(get_task_or_404(task.pk), change)
+
+
+def _save_task(task, change):
+    if task.is_archived:
+        task = task.restore()
+    change(task)
+    task.save(force_update=True)
+    return task
 
 
 class TaskListView(View):
+    rows_marker = "<!-- task rows -->"
+    stream_chunk_size = 200
+
     def get(self, request):
         search_query = request.GET.get("search", "").strip()
+        include_archived = request.GET.get("archived") == "1"
 
+        querysets = [Task.objects.all()]
+        if include_archived:
+            querysets.append(ArchivedTask.objects.all())
         if search_query:
-            tasks = Task.objects.filter(
-                Q(title__icontains=search_query)
-                | Q(description__icontains=search_query)
+            search = Q(title__icontains=search_query) | Q(
+                description__icontains=search_query
             )
-        else:
-            tasks = Task.objects.all()
+            querysets = [queryset.filter(search) for queryset in querysets]
+
+        context = {"search_query": search_query, "include_archived": include_archived}
+
+        if settings.TODOS_STREAM_TASK_LIST:
+            return self.stream(request, querysets, context)
+
+        tasks = querysets[0] if len(querysets) == 1 else list(self.merge(querysets))
+        return render(request, "todos/task_list.html", {"tasks": tasks, **context})
+
+    def merge(self, querysets):
+        """
+        Iterate over the tasks of ``querysets``, each ordered newest first,
+        interleaved so the combined sequence is newest first too.
+        """
+        return heapq.merge(
+            *(
+                queryset.iterator(chunk_size=self.stream_chunk_size)
+                for queryset in querysets
+            ),
+            key=attrgetter("created_at"),
+            reverse=True,
+        )
 
-        return render(
-            request,
+    def stream(self, request, querysets, context):
+        """
+        Send the page around the table straight away, then the table rows in
+        chunks of ``stream_chunk_size`` while iterating the querysets.
+        """
+        # Render the surrounding page and issue the CSRF token now, so that
+        # messages and the CSRF cookie are handled by the middleware before
+        # the body starts streaming.
+        page = render_to_string(
             "todos/task_list.html",
-            {"tasks": tasks, "search_query": search_query},
+            {"rows_marker": self.rows_marker, **context},
+            request,
+        )
+        head, tail = page.split(self.rows_marker)
+        get_token(request)
+        return StreamingHttpResponse(
+            self.stream_content(request, querysets, context, head, tail)
         )
 
+    def stream_content(self, request, querysets, context, head, tail):
+        yield head
+        rows = get_template("todos/task_list_rows.html")
+        chunk = []
+        sent_rows = False
+        for task in self.merge(querysets):
+            chunk.append(task)
+            if len(chunk) == self.stream_chunk_size:
+                yield rows.render({"tasks": chunk}, request)
+                chunk = []
+                sent_rows = True
+        if chunk or not sent_rows:
+            # An empty chunk renders the "no tasks" row.
+            yield rows.render({"tasks": chunk, **context}, request)
+        yield tail
+
 
 class TaskCreateView(View):
     def get(self, request):
-        return render(request, "todos/task_create.html")
+        return render(
+            request,
+            "todos/task_create.html",
+            {"idempotency_key": uuid.uuid4().hex},
+        )
 
     def post(self, request):
         title = request.POST.get("title", "").strip()
         description = request.POST.get("description", "").strip()
+        idempotency_key = request.POST.get("idempotency_key", "")
+        if not re_idempotency_key.fullmatch(idempotency_key):
+            idempotency_key = ""
 
         if not title:
             messages.error(request, "Title is required.")
             return render(
                 request,
                 "todos/task_create.html",
-                {"title": title, "description": description},
+                {
+                    "title": title,
+                    "description": description,
+                    "idempotency_key": idempotency_key or uuid.uuid4().hex,
+                },
             )
 
-        Task.objects.create(title=title, description=description)
+        with transaction.atomic():
+            if idempotency_key:
+                _, created = IdempotencyKey.objects.get_or_create(key=idempotency_key)
+                if not created:
+                    # A replayed submission: answer like the original did.
+                    return redirect("task_list")
+            Task.objects.create(title=title, description=description)
+
         messages.success(request, "Task created successfully!")
         return redirect("task_list")
 
 
 class TaskDetailView(View):
     def get(self, request, pk):
-        task = get_object_or_404(Task, pk=pk)
+        task = get_task_or_404(pk)
         return render(request, "todos/task_detail.html", {"task": task})
 
 
 class TaskEditView(View):
     def get(self, request, pk):
-        task = get_object_or_404(Task, pk=pk)
+        task = get_task_or_404(pk)
         return render(request, "todos/task_edit.html", {"task": task})
 
     def post(self, request, pk):
-        task = get_object_or_404(Task, pk=pk)
+        task = get_task_or_404(pk)
         title = request.POST.get("title", "").strip()
         description = request.POST.get("description", "").strip()
         is_complete = "is_complete" in request.POST
@@ -77,10 +198,12 @@ class TaskEditView(View):
                 },
             )
 
-        task.title = title
-        task.description = description
-        task.is_complete = is_complete
-        task.save()
+        def change(task):
+            task.title = title
+            task.description = description
+            task.is_complete = is_complete
+
+        save_task(task, change)
 
         messages.success(request, "Task updated successfully!")
         return redirect("task_list")
@@ -88,11 +211,11 @@ class TaskEditView(View):
 
 class TaskDeleteView(View):
     def get(self, request, pk):
-        task = get_object_or_404(Task, pk=pk)
+        task = get_task_or_404(pk)
         return render(request, "todos/task_delete.html", {"task": task})
 
     def post(self, request, pk):
-        task = get_object_or_404(Task, pk=pk)
+        task = get_task_or_404(pk)
         task_title = task.title
         task.delete()
         messages.success(request, f'Task "{task_title}" deleted successfully!')
@@ -101,9 +224,10 @@ class TaskDeleteView(View):
 
 class TaskToggleView(View):
     def post(self, request, pk):
-        task = get_object_or_404(Task, pk=pk)
-        task.is_complete = not task.is_complete
-        task.save()
+        def change(task):
+            task.is_complete = not task.is_complete
+
+        task = save_task(get_task_or_404(pk), change)
 
         if task.is_complete:
             messages.success(request, f'Task "{task.title}" marked as complete!')